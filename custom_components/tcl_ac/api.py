@@ -1,16 +1,23 @@
 """Local API for TCL AC control."""
 import asyncio
+from functools import partial
+import hashlib
 import logging
+import time
 from typing import Optional
 
 import aiohttp
 from aiohttp.client_exceptions import ClientError
+from homeassistant.util.json import json_loads
 
 from .const import (
+    CONTROL_BATCH_DELAY,
     CONTROL_ENDPOINT,
     DEFAULT_PORT,
     DEFAULT_POLL_INTERVAL,
     LOGGER_NAME,
+    MAX_RESPONSE_SIZE,
+    STATUS_CACHE_TTL,
     STATUS_ENDPOINT,
     SUPPORTED_MODES,
     SUPPORTED_FAN_SPEEDS,
@@ -18,6 +25,19 @@ from .const import (
 
 _LOGGER = logging.getLogger(LOGGER_NAME)
 
+# Built once and shared by every request. The short connect budget spots a
+# dead or unreachable unit quickly, while sock_read leaves room for the unit's
+# slow embedded web server to answer once it is connected.
+_REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=10, connect=2, sock_read=8)
+# Control commands are small and user-facing, so fail them sooner.
+_CONTROL_TIMEOUT = aiohttp.ClientTimeout(total=8, connect=2, sock_read=6)
+# A timed-out request is retried once after this many seconds.
+_TIMEOUT_RETRY_DELAY = 0.5
+
+# Frozen once for O(1) validation of control commands
+_VALID_MODES = frozenset(SUPPORTED_MODES)
+_VALID_FAN_SPEEDS = frozenset(SUPPORTED_FAN_SPEEDS)
+
 
 class TclApiError(Exception):
     """Exception to indicate a general API error."""
@@ -39,24 +59,72 @@ class TclApi:
         self._port = port
         self._poll_interval = poll_interval
         self._base_url = f"http://{host}:{port}"
+        self._status_url = f"{self._base_url}{STATUS_ENDPOINT}"
+        self._control_url = f"{self._base_url}{CONTROL_ENDPOINT}"
+        self._pending_command: dict = {}
+        self._pending_result: Optional[asyncio.Future] = None
+        # Strong references to running flushes, so they aren't garbage
+        # collected mid-request and can be cancelled by close()
+        self._flush_tasks: set[asyncio.Task] = set()
+        # Control batches reach the unit one at a time and in order, so a
+        # retried batch can never land after a newer one
+        self._control_lock = asyncio.Lock()
+        self._last_status_digest: Optional[bytes] = None
+        self._last_etag: Optional[str] = None
+        self._last_status: Optional[dict] = None
+        # Together with _control_lock this keeps at most one status read and
+        # one control write in flight per unit
+        self._status_lock = asyncio.Lock()
+        self._status_fetched_at = 0.0
 
-    async def _request(self, method: str, endpoint: str, data: Optional[dict] = None) -> dict:
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        data: Optional[dict] = None,
+        timeout: aiohttp.ClientTimeout = _REQUEST_TIMEOUT,
+    ) -> dict:
         """Make an async HTTP request to the local AC unit."""
-        url = f"{self._base_url}{endpoint}"
+        body, _ = await self._fetch(method, url, data, timeout)
+        return self._decode(url, body)
+
+    async def _fetch(
+        self,
+        method: str,
+        url: str,
+        data: Optional[dict] = None,
+        timeout: aiohttp.ClientTimeout = _REQUEST_TIMEOUT,
+        headers: Optional[dict] = None,
+    ) -> tuple[Optional[bytes], Optional[str]]:
+        """Send a request to the local AC unit.
+
+        Returns the raw body together with the response's ETag. The body is
+        None when the unit answers a conditional request with 304. A request
+        that times out is retried once, since the unit's Wi-Fi link drops
+        the odd packet. Control commands set absolute values and batches are
+        sent one at a time under _control_lock, so repeating one can't undo
+        a newer command. The retry roughly doubles the worst case per call.
+        """
         _LOGGER.debug("Request to %s: %s", url, data)
 
         try:
-            async with self._session.request(
-                method,
-                url,
-                json=data,
-                timeout=aiohttp.ClientTimeout(total=10),
-            ) as response:
-                response.raise_for_status()
-                return await response.json()
+            try:
+                body, etag = await self._send(method, url, data, timeout, headers)
+            except (aiohttp.ServerTimeoutError, asyncio.TimeoutError) as err:
+                _LOGGER.debug("Request to %s timed out (%r), retrying", url, err)
+                await asyncio.sleep(_TIMEOUT_RETRY_DELAY)
+                body, etag = await self._send(method, url, data, timeout, headers)
+
+        except TclApiError:
+            raise
+
+        except aiohttp.ServerTimeoutError as err:
+            # Socket-level connect or read timeout; the message says which.
+            _LOGGER.error("Timeout talking to %s: %s", url, err)
+            raise TclApiError(f"Timeout talking to AC unit at {url}: {err}")
 
         except asyncio.TimeoutError:
-            _LOGGER.error("Timeout connecting to %s", url)
+            _LOGGER.error("Request to %s exceeded %ss", url, timeout.total)
             raise TclApiError(f"Timeout connecting to AC unit at {url}")
 
         except ClientError as err:
@@ -67,51 +135,231 @@ class TclApi:
             _LOGGER.error("Unexpected error: %s", err)
             raise TclApiError(f"Unexpected error: {err}")
 
+        if body is not None and _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Response from %s: %s", url, body[:1000])
+        return body, etag
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        data: Optional[dict],
+        timeout: aiohttp.ClientTimeout,
+        headers: Optional[dict],
+    ) -> tuple[Optional[bytes], Optional[str]]:
+        """Perform a single HTTP exchange with the unit."""
+        async with self._session.request(
+            method,
+            url,
+            json=data,
+            headers=headers,
+            timeout=timeout,
+        ) as response:
+            response.raise_for_status()
+            etag = response.headers.get("ETag")
+            if response.status == 304:
+                _LOGGER.debug("Response from %s: not modified", url)
+                return None, etag
+            # Reject an oversized declared length straight away, and cap the
+            # read itself for chunked replies or ones that don't send one.
+            if (response.content_length or 0) > MAX_RESPONSE_SIZE:
+                raise TclApiError(
+                    f"Response from {url} too large: {response.content_length} bytes"
+                )
+            # read(n) returns whatever has arrived, so loop until EOF or
+            # just past the cap.
+            body = bytearray()
+            while len(body) <= MAX_RESPONSE_SIZE:
+                chunk = await response.content.read(MAX_RESPONSE_SIZE + 1 - len(body))
+                if not chunk:
+                    break
+                body += chunk
+            if len(body) > MAX_RESPONSE_SIZE:
+                raise TclApiError(
+                    f"Response from {url} exceeds {MAX_RESPONSE_SIZE} bytes"
+                )
+            return bytes(body), etag
+
+    @staticmethod
+    def _decode(url: str, body: bytes) -> dict:
+        """Decode a JSON response body from the AC unit."""
+        # Parse the raw bytes once with HA's orjson-backed loader; this also
+        # accepts units that don't label their replies as application/json.
+        try:
+            return json_loads(body)
+        except ValueError as err:
+            _LOGGER.error("Invalid JSON from AC unit: %s", err)
+            raise TclApiError(f"Invalid JSON from AC unit at {url}: {err}")
+
     async def get_status(self) -> dict:
-        """Get current status of the AC unit."""
-        return await self._request("GET", STATUS_ENDPOINT)
+        """Get current status of the AC unit.
+
+        Concurrent callers share a single request, and a status fetched less
+        than STATUS_CACHE_TTL seconds ago is returned without asking the unit
+        again. Polls are conditional on the last ETag when the unit sends one,
+        and when it answers 304 or returns the same body as the previous poll,
+        the dict parsed last time is returned as-is instead of decoding it
+        again. Callers must treat the returned dict as read-only.
+        """
+        async with self._status_lock:
+            if (
+                self._last_status is not None
+                and time.monotonic() - self._status_fetched_at < STATUS_CACHE_TTL
+            ):
+                return self._last_status
+
+            headers = None
+            if self._last_etag is not None and self._last_status is not None:
+                headers = {"If-None-Match": self._last_etag}
+            body, etag = await self._fetch(
+                "GET", self._status_url, headers=headers
+            )
+            self._status_fetched_at = time.monotonic()
+            if body is None:
+                return self._last_status
+            # A short fingerprint is enough to spot an unchanged reply and
+            # avoids keeping the whole previous body around.
+            digest = hashlib.blake2b(body, digest_size=8).digest()
+            if digest == self._last_status_digest:
+                # Same status, but the unit may have issued a new tag for it
+                self._last_etag = etag
+                return self._last_status
+
+            status = self._decode(self._status_url, body)
+            self._last_status_digest, self._last_status = digest, status
+            self._last_etag = etag
+            return status
+
+    async def _control(self, command: dict) -> bool:
+        """Queue a control command and wait for the batch carrying it.
+
+        Commands issued within CONTROL_BATCH_DELAY of each other are merged
+        into a single POST, so changing mode, temperature and fan speed
+        together costs one round-trip to the unit instead of three.
+        """
+        self._pending_command.update(command)
+        if self._pending_result is None:
+            self._pending_result = asyncio.get_running_loop().create_future()
+            task = asyncio.create_task(self._flush_control(self._pending_result))
+            self._flush_tasks.add(task)
+            task.add_done_callback(partial(self._flush_done, self._pending_result))
+        return await asyncio.shield(self._pending_result)
+
+    async def _flush_control(self, result: asyncio.Future) -> None:
+        """Send all commands queued during the batch window in one request."""
+        await asyncio.sleep(CONTROL_BATCH_DELAY)
+        command, self._pending_command = self._pending_command, {}
+        self._pending_result = None
+
+        try:
+            async with self._control_lock:
+                response = await self._request(
+                    "POST", self._control_url, command, _CONTROL_TIMEOUT
+                )
+        except TclApiError as err:
+            result.set_exception(err)
+            return
+
+        if not isinstance(response, dict):
+            _LOGGER.error("Unexpected control reply from AC unit: %r", response)
+            result.set_exception(
+                TclApiError(f"Unexpected control reply from AC unit at {self._control_url}")
+            )
+            return
+
+        success = response.get("success", False)
+        if success and self._last_status is not None:
+            # Apply the accepted command to the cached status optimistically,
+            # so a coordinator poll landing within STATUS_CACHE_TTL of the
+            # command is answered from memory with the new values.
+            self._last_status = {**self._last_status, **command}
+            self._last_status_digest = None
+            self._last_etag = None
+            self._status_fetched_at = time.monotonic()
+        else:
+            self._status_fetched_at = 0.0
+        result.set_result(success)
+
+    def _flush_done(self, result: asyncio.Future, task: asyncio.Task) -> None:
+        """Settle the callers' future however the flush task ended.
+
+        Runs as a done callback rather than a finally block, so it also
+        covers a flush cancelled before it ever started running. An error
+        the flush didn't handle itself reaches the callers as TclApiError.
+        """
+        self._flush_tasks.discard(task)
+        if self._pending_result is result:
+            # Cancelled during the batch window; drop the unsent batch
+            self._pending_command, self._pending_result = {}, None
+        err = None if task.cancelled() else task.exception()
+        if result.done():
+            return
+        if err is not None:
+            _LOGGER.error("Unexpected error sending control command: %s", err)
+            exc = TclApiError(f"Unexpected error: {err}")
+            exc.__cause__ = err
+            result.set_exception(exc)
+        else:
+            result.cancel()
+
+    async def close(self) -> None:
+        """Cancel control batches still pending or in flight."""
+        tasks = list(self._flush_tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
 
     async def set_power(self, power: bool) -> bool:
         """Turn AC unit on/off."""
-        result = await self._request(
-            "POST",
-            CONTROL_ENDPOINT,
-            {"power": "on" if power else "off"},
-        )
-        return result.get("success", False)
+        return await self._control({"power": "on" if power else "off"})
 
     async def set_mode(self, mode: str) -> bool:
         """Set AC operation mode."""
-        if mode not in SUPPORTED_MODES:
+        if mode not in _VALID_MODES:
             raise TclApiError(f"Unsupported mode: {mode}")
 
-        result = await self._request(
-            "POST",
-            CONTROL_ENDPOINT,
-            {"mode": mode},
-        )
-        return result.get("success", False)
+        return await self._control({"mode": mode})
 
     async def set_temperature(self, temperature: float) -> bool:
         """Set target temperature."""
-        result = await self._request(
-            "POST",
-            CONTROL_ENDPOINT,
-            {"temperature": temperature},
-        )
-        return result.get("success", False)
+        return await self._control({"temperature": temperature})
 
     async def set_fan_speed(self, fan_speed: str) -> bool:
         """Set fan speed."""
-        if fan_speed not in SUPPORTED_FAN_SPEEDS:
+        if fan_speed not in _VALID_FAN_SPEEDS:
             raise TclApiError(f"Unsupported fan speed: {fan_speed}")
 
-        result = await self._request(
-            "POST",
-            CONTROL_ENDPOINT,
-            {"fan_speed": fan_speed},
-        )
-        return result.get("success", False)
+        return await self._control({"fan_speed": fan_speed})
+
+    async def set_state(
+        self,
+        power: Optional[bool] = None,
+        mode: Optional[str] = None,
+        temperature: Optional[float] = None,
+        fan_speed: Optional[str] = None,
+    ) -> bool:
+        """Change several settings in a single control request.
+
+        Only the settings that are passed are sent. The command still joins
+        any batch already pending, so it never costs more than one POST.
+        """
+        command: dict = {}
+        if power is not None:
+            command["power"] = "on" if power else "off"
+        if mode is not None:
+            if mode not in _VALID_MODES:
+                raise TclApiError(f"Unsupported mode: {mode}")
+            command["mode"] = mode
+        if temperature is not None:
+            command["temperature"] = temperature
+        if fan_speed is not None:
+            if fan_speed not in _VALID_FAN_SPEEDS:
+                raise TclApiError(f"Unsupported fan speed: {fan_speed}")
+            command["fan_speed"] = fan_speed
+
+        if not command:
+            return True
+        return await self._control(command)
 
     async def update(self) -> dict:
         """Get full status update."""
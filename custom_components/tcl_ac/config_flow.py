@@ -1,4 +1,5 @@
 """Config flow for TCL Home Assistant local integration."""
+import asyncio
 import logging
 from typing import Any, Dict, Optional
 
@@ -12,14 +13,36 @@ from homeassistant.const import CONF_HOST, CONF_PORT
 from .const import (
     DOMAIN,
     DEFAULT_PORT,
+    DEFAULT_POLL_INTERVAL,
+    MIN_POLL_INTERVAL,
     LOGGER_NAME,
     CONF_DEVICE_ID,
     CONF_POLL_INTERVAL
 )
 from .api import TclApi, TclApiError
+from .coordinator import get_poll_interval
 
 _LOGGER = logging.getLogger(LOGGER_NAME)
 
+# Seconds to wait for the unit to answer the setup probe; a wrong or dead
+# host should fail the form quickly instead of hanging the flow
+_PROBE_TIMEOUT = 3
+
+# The poll interval drives the coordinator directly, so keep it sane
+_POLL_INTERVAL = vol.All(vol.Coerce(int), vol.Range(min=MIN_POLL_INTERVAL))
+
+# Static, so build it once instead of on every form render
+STEP_USER_DATA_SCHEMA = vol.Schema({
+    vol.Required(CONF_HOST): str,
+    vol.Optional(CONF_PORT, default=DEFAULT_PORT): int,
+    vol.Optional(CONF_POLL_INTERVAL, default=DEFAULT_POLL_INTERVAL): _POLL_INTERVAL,
+})
+
+# The current value is filled in per render as a suggested value
+OPTIONS_SCHEMA = vol.Schema({
+    vol.Optional(CONF_POLL_INTERVAL): _POLL_INTERVAL,
+})
+
 
 class TclConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for local TCL integration."""
@@ -39,7 +62,9 @@ class TclConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         errors: Dict[str, str] = {}
 
         if user_input is not None:
-            host = user_input[CONF_HOST]
+            # Normalise once so stray whitespace or case can't slip a
+            # duplicate of an existing host past the unique ID check
+            host = user_input[CONF_HOST].strip().lower()
             port = user_input.get(CONF_PORT, DEFAULT_PORT)
 
             # Use host as unique ID for local setup
@@ -50,10 +75,12 @@ class TclConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             self._api_client = TclApi(session, host, port)
 
             try:
-                # Test connection by getting status
-                status = await self._api_client.get_status()
+                # Test connection by getting status. Known hosts were
+                # already aborted above, so only new ones are probed.
+                async with asyncio.timeout(_PROBE_TIMEOUT):
+                    status = await self._api_client.get_status()
                 if status:
-                    self._config_data = user_input.copy()
+                    self._config_data = {**user_input, CONF_HOST: host}
                     self._config_data[CONF_DEVICE_ID] = status.get("device_id", host)
                     return self.async_create_entry(
                         title=f"TCL AC ({host})",
@@ -65,19 +92,16 @@ class TclConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             except TclApiError as e:
                 _LOGGER.error("Connection error to %s:%s: %s", host, port, e)
                 errors["base"] = "cannot_connect"
+            except TimeoutError:
+                _LOGGER.error("No reply from %s:%s within %ss", host, port, _PROBE_TIMEOUT)
+                errors["base"] = "cannot_connect"
             except Exception as e:
                 _LOGGER.exception("Unexpected exception: %s", e)
                 errors["base"] = "unknown"
 
-        data_schema = vol.Schema({
-            vol.Required(CONF_HOST): str,
-            vol.Optional(CONF_PORT, default=DEFAULT_PORT): int,
-            vol.Optional(CONF_POLL_INTERVAL, default=30): int,
-        })
-
         return self.async_show_form(
             step_id="user",
-            data_schema=data_schema,
+            data_schema=STEP_USER_DATA_SCHEMA,
             errors=errors
         )
 
@@ -100,14 +124,9 @@ class TclOptionsFlowHandler(config_entries.OptionsFlow):
         if user_input is not None:
             return self.async_create_entry(title="", data=user_input)
 
-        options_schema = vol.Schema({
-            vol.Optional(
-                CONF_POLL_INTERVAL,
-                default=self.config_entry.options.get(CONF_POLL_INTERVAL, 30)
-            ): int,
-        })
-
         return self.async_show_form(
             step_id="init",
-            data_schema=options_schema
+            data_schema=self.add_suggested_values_to_schema(
+                OPTIONS_SCHEMA, {CONF_POLL_INTERVAL: get_poll_interval(self.config_entry)}
+            ),
         )
@@ -11,10 +11,15 @@ CONF_POLL_INTERVAL = "poll_interval"
 # Default values
 DEFAULT_PORT = 5000
 DEFAULT_POLL_INTERVAL = 30  # seconds
+MIN_POLL_INTERVAL = 5  # seconds; anything shorter hammers the unit
+CONTROL_BATCH_DELAY = 0.05  # seconds to collect control commands into one request
+STATUS_CACHE_TTL = 2  # seconds a fetched status is shared between callers
+COMMAND_REFRESH_DELAY = 5  # seconds before re-reading state after a command
 
 # Local API endpoints
 CONTROL_ENDPOINT = "/api/control"
 STATUS_ENDPOINT = "/api/status"
+MAX_RESPONSE_SIZE = 64 * 1024  # bytes
 
 # Platforms
 PLATFORMS = ["climate"]
@@ -0,0 +1,47 @@
+"""Data update coordinator for the TCL AC integration."""
+from datetime import timedelta
+import logging
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+
+from .api import TclApi, TclApiError
+from .const import CONF_POLL_INTERVAL, DEFAULT_POLL_INTERVAL, DOMAIN, LOGGER_NAME
+
+_LOGGER = logging.getLogger(LOGGER_NAME)
+
+
+def get_poll_interval(config_entry: ConfigEntry) -> int:
+    """Return the entry's poll interval: options, then setup data, then default."""
+    return config_entry.options.get(
+        CONF_POLL_INTERVAL,
+        config_entry.data.get(CONF_POLL_INTERVAL, DEFAULT_POLL_INTERVAL),
+    )
+
+
+class TclDataUpdateCoordinator(DataUpdateCoordinator):
+    """Poll the status of a local TCL AC unit once per interval."""
+
+    config_entry: ConfigEntry
+
+    def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry, api: TclApi):
+        """Initialize the coordinator."""
+        super().__init__(
+            hass,
+            _LOGGER,
+            config_entry=config_entry,
+            name=DOMAIN,
+            update_interval=timedelta(seconds=get_poll_interval(config_entry)),
+            # AC state rarely changes between polls; only notify entities
+            # when the status dict actually differs from the last one.
+            always_update=False,
+        )
+        self.api = api
+
+    async def _async_update_data(self) -> dict:
+        """Fetch the latest status from the AC unit."""
+        try:
+            return await self.api.get_status()
+        except TclApiError as err:
+            raise UpdateFailed(f"Error communicating with AC unit: {err}") from err